@@ -27,8 +27,6 @@ import argparse
 import os
 import sys
 
-from pdfmerger.core import discover_pdfs, merge_pdfs
-
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Merge a folder of PDFs (handles password-protected files) into one unlocked PDF.")
@@ -46,6 +44,9 @@ def main() -> None:
         print(f"Folder not found: {args.folder}", file=sys.stderr)
         sys.exit(1)
 
+    # Deferred so --help and argument errors never pay for importing the PDF stack.
+    from pdfmerger.core import discover_pdfs, merge_pdfs
+
     pdfs = discover_pdfs(args.folder, recursive=args.recursive, pattern=args.pattern)
     if not pdfs:
         print("No PDFs found with the given criteria.")
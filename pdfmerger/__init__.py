@@ -6,6 +6,7 @@ from .core import (
     MergeOutput,
     PDFInput,
     discover_pdfs,
+    discover_pdfs_iter,
     images_to_pdf_streams,
     merge_pdf_streams,
     merge_pdfs,
@@ -19,6 +20,7 @@ __all__ = [
     "MergeOutput",
     "PDFInput",
     "discover_pdfs",
+    "discover_pdfs_iter",
     "images_to_pdf_streams",
     "merge_pdf_streams",
     "merge_pdfs",
@@ -0,0 +1,31 @@
+"""Type-stable hot paths for file discovery and sorting.
+
+Kept free of other project imports so it can be compiled on its own with
+``mypyc pdfmerger/_fast.py``; the resulting extension module takes precedence
+over this file, which otherwise runs as plain Python.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Pattern, Tuple, Union
+
+_NATURAL_TOKEN = re.compile(r"(\d+)|(\D+)")
+
+
+def natural_key(value: str) -> Tuple[Union[int, str], ...]:
+    """Sort key that treats digit runs numerically: file2 < file10 < file100."""
+
+    key: Tuple[Union[int, str], ...] = tuple(
+        [int(digits) if digits else text.lower() for digits, text in _NATURAL_TOKEN.findall(value)]
+    )
+    if key and isinstance(key[0], int):
+        # Always lead with text so two keys compare str-to-str and int-to-int.
+        key = ("",) + key
+    return key
+
+
+def is_pdf_match(name: str, pattern: Pattern[str]) -> bool:
+    """Return True if *name* has a .pdf suffix and matches the compiled glob *pattern*."""
+
+    return name.lower().endswith(".pdf") and pattern.match(name) is not None
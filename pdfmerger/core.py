@@ -3,18 +3,95 @@
 from __future__ import annotations
 
 import fnmatch
+import functools
+import importlib
 import io
+import itertools
 import os
+import re
+import shutil
+import subprocess
+import tempfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass
 from getpass import getpass
-from typing import BinaryIO, Iterable, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-try:
+from ._fast import is_pdf_match
+from ._fast import natural_key as _natural_key
+
+if TYPE_CHECKING:
+    import pikepdf
     from PyPDF2 import PdfReader, PdfWriter
-except Exception as exc:  # pragma: no cover - import guard kept for CLI compatibility
-    raise RuntimeError(
-        "PyPDF2 is required. Install with: python -m pip install PyPDF2"
-    ) from exc
+else:
+    # Bound by _ensure_pypdf2() and _ensure_pikepdf() so importing this module
+    # (and --help) stays cheap.
+    PdfReader = PdfWriter = pikepdf = None
+
+
+def _ensure_pypdf2() -> None:
+    """Import PyPDF2 into this module on first use."""
+
+    global PdfReader, PdfWriter
+    if PdfWriter is not None:
+        return
+    try:
+        from PyPDF2 import PdfReader, PdfWriter
+    except Exception as exc:  # pragma: no cover - import guard kept for CLI compatibility
+        raise RuntimeError(
+            "PyPDF2 is required. Install with: python -m pip install PyPDF2"
+        ) from exc
+
+
+@functools.lru_cache(maxsize=None)
+def _optional_import(name: str):
+    """Return module *name*, or None if it is not installed; tried once per process."""
+
+    try:
+        return importlib.import_module(name)
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+
+
+def _ensure_pikepdf() -> bool:
+    """Import pikepdf (the optional qpdf-backed fast path) on first use; False if missing."""
+
+    global pikepdf
+    if pikepdf is None:
+        pikepdf = _optional_import("pikepdf")
+    return pikepdf is not None
+
+
+# Non-seekable inputs are copied into a spool that stays in RAM up to this
+# size and spills to disk beyond it.
+_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+# Chunk size for copying PDF data between files, also used by the web app.
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# How much of each end of a file to scan for an /Encrypt trailer entry.
+_ENCRYPT_SNIFF_SIZE = 8192
+
+# Merged output stays in RAM up to this size, then spills to a temporary file.
+_OUTPUT_SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+_JPEG_MAGIC = b"\xff\xd8\xff"
+
+# JPEG modes that can be embedded from the original bitstream. CMYK is left
+# out: Adobe-style inverted CMYK needs a /Decode array to display correctly.
+_JPEG_COLORSPACES = {"L": "/DeviceGray", "RGB": "/DeviceRGB"}
+
+# PyPDF2 issues many tiny write() calls; batch them into few large syscalls.
+_OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Outputs at least this large are synced and dropped from the page cache once
+# written; below it the fsync costs more than the cache pressure it saves.
+_DROP_CACHE_MIN_SIZE = 64 * 1024 * 1024
+
+_PDFSource = Union[str, bytes, BinaryIO]
 
 
 @dataclass
@@ -30,10 +107,13 @@ class PDFInput:
 class MergeOutput:
     """Result from merging PDFs."""
 
-    buffer: Optional[io.BytesIO]
+    buffer: Optional[BinaryIO]
     merged_count: int
     skipped_count: int
     skipped_files: List[str]
+    # Set when ``named_output`` spilled the result to disk: *buffer* is then the
+    # open file at this path, and the caller must delete it when done.
+    path: Optional[str] = None
 
     @property
     def has_output(self) -> bool:
@@ -77,31 +157,49 @@ class CompressOutput:
         return self.buffer is not None and not self.skipped
 
 
-def natural_key(value: str) -> List[object]:
+@functools.lru_cache(maxsize=4096)
+def natural_key(value: str) -> Tuple[object, ...]:
     """Sort helper that treats digits numerically: file2 < file10 < file100."""
 
-    import re
+    return _natural_key(value)
 
-    return [int(text) if text.isdigit() else text.lower() for text in re.split(r"(\d+)", value)]
 
+def discover_pdfs_iter(folder: str, recursive: bool, pattern: str) -> Iterator[str]:
+    """Yield PDFs within *folder* that match *pattern* (case-insensitive) as they are found.
 
-def discover_pdfs(folder: str, recursive: bool, pattern: str) -> List[str]:
-    """Return a list of PDFs within *folder* that match *pattern*."""
+    Order follows the directory listing; an unreadable *folder* raises on the
+    first ``next()`` rather than at call time.
+    """
 
     folder = os.path.abspath(folder)
-    matches: List[str] = []
+    name_pattern = re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+    pending = [folder]
+
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            # Mirror os.walk: unreadable subfolders are skipped, not fatal.
+            if directory == folder:
+                raise
+            continue
+
+        with entries:
+            for entry in entries:
+                # DirEntry caches the type from the directory read, so these
+                # checks need no extra stat() for regular files and folders.
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                elif entry.is_file() and is_pdf_match(entry.name, name_pattern):
+                    yield entry.path
 
-    if recursive:
-        for root, _, files in os.walk(folder):
-            for filename in files:
-                if filename.lower().endswith(".pdf") and fnmatch.fnmatch(filename, pattern):
-                    matches.append(os.path.join(root, filename))
-    else:
-        for filename in os.listdir(folder):
-            if filename.lower().endswith(".pdf") and fnmatch.fnmatch(filename, pattern):
-                matches.append(os.path.join(folder, filename))
 
-    return matches
+def discover_pdfs(folder: str, recursive: bool, pattern: str) -> List[str]:
+    """Return a list of PDFs within *folder* that match *pattern* (case-insensitive)."""
+
+    return list(discover_pdfs_iter(folder, recursive, pattern))
 
 
 def try_decrypt(reader: PdfReader, password: str) -> bool:
@@ -119,58 +217,290 @@ def try_decrypt(reader: PdfReader, password: str) -> bool:
         return False
 
 
-def _passwords_to_try(pdf_input: PDFInput, default_password: Optional[str]) -> List[str]:
-    passwords: List[str] = []
-    if default_password:
-        passwords.append(default_password)
-    if pdf_input.password and pdf_input.password not in passwords:
-        passwords.append(pdf_input.password)
-    return passwords
+def _base_passwords(default_password: Optional[str]) -> Tuple[str, ...]:
+    return (default_password,) if default_password else ()
 
 
-def merge_pdf_streams(
-    inputs: Iterable[PDFInput],
-    default_password: Optional[str] = None,
+def _passwords_to_try(pdf_input: PDFInput, base_passwords: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Return *base_passwords* plus the input's own password, reusing the shared tuple when possible."""
+
+    if not pdf_input.password or pdf_input.password in base_passwords:
+        return base_passwords
+    return base_passwords + (pdf_input.password,)
+
+
+@dataclass
+class _ParsedPDF:
+    """Outcome of opening a single PDF."""
+
+    reader: Optional[PdfReader] = None
+    locked: bool = False
+    error: Optional[str] = None
+
+
+def _append_pages(writer: PdfWriter, reader: PdfReader) -> None:
+    """Append every page of *reader* to *writer*, one call per file where supported."""
+
+    if hasattr(writer, "append"):  # PyPDF2 >= 3.0
+        writer.append(reader, import_outline=False)
+        return
+    for page in reader.pages:
+        writer.add_page(page)
+
+
+def _parse_one(source: _PDFSource, passwords: Sequence[str]) -> _ParsedPDF:
+    """Open and decrypt *source*, trying each of *passwords* if it is encrypted."""
+
+    try:
+        if isinstance(source, str):
+            source = _read_bytes(source)
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        reader = PdfReader(source, strict=False)
+
+        if getattr(reader, "is_encrypted", False):
+            if not any(password and try_decrypt(reader, password) for password in passwords):
+                return _ParsedPDF(locked=True)
+    except Exception as exc:
+        return _ParsedPDF(error=str(exc) or exc.__class__.__name__)
+
+    return _ParsedPDF(reader=reader)
+
+
+def _fadvise(fd: int, *advice: str) -> None:
+    """Apply each named ``POSIX_FADV_*`` hint to the whole of *fd*, where supported.
+
+    The advice values are an enumeration, not bit flags, so each is issued
+    separately. Hints are best-effort and never raise.
+    """
+
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for name in advice:
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, name))
+        except (AttributeError, OSError):
+            pass
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as pdf_file:
+        _fadvise(pdf_file.fileno(), "POSIX_FADV_SEQUENTIAL", "POSIX_FADV_NOREUSE")
+        return pdf_file.read()
+
+
+def _prefetch_iter(paths: Iterable[str], lookahead: int = 2) -> Iterator[Tuple[str, "Future[bytes]"]]:
+    """Yield ``(path, future)`` pairs in order, reading up to *lookahead* files ahead.
+
+    Reads run on background threads so disk I/O overlaps with parsing the
+    current file; at most *lookahead* + 1 files are held in memory.
+    """
+
+    remaining = iter(paths)
+    with ThreadPoolExecutor(max_workers=lookahead) as executor:
+        pending: "deque[Tuple[str, Future[bytes]]]" = deque(
+            (path, executor.submit(_read_bytes, path)) for path in itertools.islice(remaining, lookahead)
+        )
+        while pending:
+            path, future = pending.popleft()
+            for next_path in itertools.islice(remaining, 1):
+                pending.append((next_path, executor.submit(_read_bytes, next_path)))
+            yield path, future
+
+
+def _parse_prefetched(paths: Sequence[str], passwords: Sequence[str]) -> Iterator[_ParsedPDF]:
+    """Yield a :class:`_ParsedPDF` per path, in order, reading files ahead of parsing."""
+
+    for _, future in _prefetch_iter(paths):
+        try:
+            data = future.result()
+        except OSError as exc:
+            yield _ParsedPDF(error=str(exc))
+            continue
+        yield _parse_one(data, passwords)
+
+
+def _rewind_input(pdf_input: PDFInput, spools: ExitStack) -> BinaryIO:
+    """Rewind ``pdf_input.stream`` and return it.
+
+    A non-seekable stream is copied into a spooled temporary file, which
+    replaces ``pdf_input.stream`` and is closed along with *spools*.
+    """
+
+    stream = pdf_input.stream
+    try:
+        stream.seek(0)
+        return stream
+    except Exception:
+        pass
+
+    spool = spools.enter_context(tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE))
+    shutil.copyfileobj(stream, spool, COPY_CHUNK_SIZE)
+    spool.seek(0)
+    pdf_input.stream = spool  # type: ignore[assignment]
+    return spool  # type: ignore[return-value]
+
+
+def _stream_size(stream: BinaryIO) -> int:
+    """Return the length of seekable *stream*, leaving it rewound."""
+
+    stream.seek(0, io.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def _is_likely_encrypted(stream: BinaryIO) -> bool:
+    """Guess whether *stream* is encrypted by scanning its first and last bytes.
+
+    The trailer normally sits at the end, and linearized files repeat it near
+    the start. A trailer elsewhere is missed, so a False result is only a hint
+    and callers must cope with it being wrong.
+    """
+
+    size = _stream_size(stream)
+    head = stream.read(_ENCRYPT_SNIFF_SIZE)
+    stream.seek(max(0, size - _ENCRYPT_SNIFF_SIZE))
+    tail = stream.read()
+    stream.seek(0)
+    return b"/Encrypt" in head or b"/Encrypt" in tail
+
+
+def _open_pikepdf(stream: BinaryIO, passwords: Sequence[str]) -> "pikepdf.Pdf":
+    """Open *stream* with pikepdf, trying no password first and then each candidate.
+
+    Raises ``pikepdf.PasswordError`` when none of them unlock the file.
+    """
+
+    error: Optional[Exception] = None
+    for password in ("", *passwords):
+        stream.seek(0)
+        try:
+            return pikepdf.open(stream, password=password)
+        except pikepdf.PasswordError as exc:
+            error = exc
+    raise error  # type: ignore[misc]
+
+
+def _spill_file(named: bool, output_dir: Optional[str] = None) -> Tuple[BinaryIO, Optional[str]]:
+    """Return an on-disk file for a large merged PDF, and its path if *named*."""
+
+    if not named:
+        return tempfile.TemporaryFile(), None
+    handle = tempfile.NamedTemporaryFile(prefix="pdfmerger-", suffix=".pdf", dir=output_dir, delete=False)
+    return handle, handle.name
+
+
+def _discard_spill(output_buffer: BinaryIO, output_path: Optional[str]) -> None:
+    output_buffer.close()
+    if output_path is not None:
+        try:
+            os.unlink(output_path)
+        except OSError:
+            pass
+
+
+def _merge_pdf_streams_pikepdf(
+    pdf_inputs: Sequence[PDFInput],
+    default_password: Optional[str],
+    spools: ExitStack,
+    named_output: bool,
+    output_dir: Optional[str],
 ) -> MergeOutput:
-    """Merge in-memory PDF streams and return a :class:`MergeOutput`."""
+    """Merge *pdf_inputs* with pikepdf, letting qpdf copy the page objects."""
 
-    writer = PdfWriter()
+    output = pikepdf.Pdf.new()
+    # Pages are copied lazily from their source, so keep sources open until saved.
+    sources: List["pikepdf.Pdf"] = []
+    base_passwords = _base_passwords(default_password)
+    estimated_size = 0
     merged_count = 0
     skipped_count = 0
     skipped_files: List[str] = []
 
-    for pdf_input in inputs:
-        stream = pdf_input.stream
-        try:
-            stream.seek(0)
-        except Exception:
-            # Some streams may be non-seekable; wrap them in BytesIO for PyPDF2.
-            stream = io.BytesIO(stream.read())  # type: ignore[arg-type]
-            pdf_input.stream = stream
+    try:
+        for pdf_input in pdf_inputs:
+            stream = _rewind_input(pdf_input, spools)
+            try:
+                source = _open_pikepdf(stream, _passwords_to_try(pdf_input, base_passwords))
+            except Exception:
+                skipped_count += 1
+                skipped_files.append(pdf_input.name)
+                continue
+            sources.append(source)
+            estimated_size += _stream_size(stream)
+
+            try:
+                output.pages.extend(source.pages)
+            except Exception:
+                skipped_count += 1
+                skipped_files.append(pdf_input.name)
+                continue
+
+            merged_count += 1
+
+        if merged_count == 0:
+            return MergeOutput(buffer=None, merged_count=0, skipped_count=skipped_count, skipped_files=skipped_files)
 
+        # pikepdf probes fileno() on its destination, which would roll a spool
+        # over to disk before the first byte, so pick memory or disk up front.
+        output_path: Optional[str] = None
+        if estimated_size > _OUTPUT_SPOOL_MAX_SIZE:
+            output_buffer, output_path = _spill_file(named_output, output_dir)
+        else:
+            output_buffer = io.BytesIO()
         try:
-            stream.seek(0)
-            reader = PdfReader(stream)
-        except Exception:
+            output.save(
+                output_buffer,
+                linearize=False,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate,
+            )
+        except BaseException:
+            _discard_spill(output_buffer, output_path)
+            raise
+    finally:
+        output.close()
+        for source in sources:
+            source.close()
+
+    output_buffer.seek(0)
+    return MergeOutput(
+        buffer=output_buffer,
+        merged_count=merged_count,
+        skipped_count=skipped_count,
+        skipped_files=skipped_files,
+        path=output_path,
+    )
+
+
+def _merge_pdf_streams_pypdf2(
+    pdf_inputs: Sequence[PDFInput],
+    default_password: Optional[str],
+    spools: ExitStack,
+    named_output: bool,
+    output_dir: Optional[str],
+) -> MergeOutput:
+    """Merge *pdf_inputs* with PyPDF2."""
+
+    _ensure_pypdf2()
+    base_passwords = _base_passwords(default_password)
+    estimated_size = 0
+    writer = PdfWriter()
+    merged_count = 0
+    skipped_count = 0
+    skipped_files: List[str] = []
+
+    for pdf_input in pdf_inputs:
+        stream = _rewind_input(pdf_input, spools)
+        estimated_size += _stream_size(stream)
+        parsed = _parse_one(stream, _passwords_to_try(pdf_input, base_passwords))
+        if parsed.locked or parsed.error is not None:
             skipped_count += 1
             skipped_files.append(pdf_input.name)
             continue
 
-        if getattr(reader, "is_encrypted", False):
-            passwords = _passwords_to_try(pdf_input, default_password)
-            unlocked = False
-            for password in passwords:
-                if password and try_decrypt(reader, password):
-                    unlocked = True
-                    break
-            if not unlocked:
-                skipped_count += 1
-                skipped_files.append(pdf_input.name)
-                continue
-
         try:
-            for page in reader.pages:
-                writer.add_page(page)
+            _append_pages(writer, parsed.reader)
         except Exception:
             skipped_count += 1
             skipped_files.append(pdf_input.name)
@@ -181,19 +511,173 @@ def merge_pdf_streams(
     if merged_count == 0:
         return MergeOutput(buffer=None, merged_count=0, skipped_count=skipped_count, skipped_files=skipped_files)
 
-    output_buffer = io.BytesIO()
-    writer.write(output_buffer)
+    # Large merges spill to disk instead of pinning a second full copy in RAM.
+    output_path: Optional[str] = None
+    if named_output and estimated_size > _OUTPUT_SPOOL_MAX_SIZE:
+        output_buffer, output_path = _spill_file(named=True, output_dir=output_dir)
+    else:
+        output_buffer = tempfile.SpooledTemporaryFile(max_size=_OUTPUT_SPOOL_MAX_SIZE)
+    try:
+        writer.write(output_buffer)
+    except BaseException:
+        _discard_spill(output_buffer, output_path)
+        raise
     output_buffer.seek(0)
     return MergeOutput(
         buffer=output_buffer,
         merged_count=merged_count,
         skipped_count=skipped_count,
         skipped_files=skipped_files,
+        path=output_path,
+    )
+
+
+def merge_pdf_streams(
+    inputs: Iterable[PDFInput],
+    default_password: Optional[str] = None,
+    named_output: bool = False,
+    output_dir: Optional[str] = None,
+) -> MergeOutput:
+    """Merge in-memory PDF streams and return a :class:`MergeOutput`.
+
+    Uses pikepdf when it is installed and falls back to PyPDF2 otherwise. With
+    *named_output*, a merge too large to keep in memory is written to a named
+    temporary file (in *output_dir*, if given) whose path is returned in
+    :attr:`MergeOutput.path`.
+    """
+
+    pdf_inputs = list(inputs)
+    with ExitStack() as spools:
+        if _ensure_pikepdf():
+            return _merge_pdf_streams_pikepdf(pdf_inputs, default_password, spools, named_output, output_dir)
+        return _merge_pdf_streams_pypdf2(pdf_inputs, default_password, spools, named_output, output_dir)
+
+
+def _append_jpeg_page(pdf: "pikepdf.Pdf", stream: BinaryIO, image_module) -> bool:
+    """Append a page to *pdf* that embeds the JPEG in *stream* byte-for-byte.
+
+    Only the JPEG header is parsed (for size and mode); pixels are never
+    decoded. Returns False when the image must be re-encoded instead.
+    """
+
+    stream.seek(0)
+    if stream.read(len(_JPEG_MAGIC)) != _JPEG_MAGIC:
+        return False
+
+    stream.seek(0)
+    with image_module.open(stream) as opened:
+        if opened.format != "JPEG" or opened.mode not in _JPEG_COLORSPACES:
+            return False
+        width, height = opened.size
+        colorspace = _JPEG_COLORSPACES[opened.mode]
+
+    stream.seek(0)
+    image = pikepdf.Stream(
+        pdf,
+        b"",
+        Type=pikepdf.Name.XObject,
+        Subtype=pikepdf.Name.Image,
+        Width=width,
+        Height=height,
+        ColorSpace=pikepdf.Name(colorspace),
+        BitsPerComponent=8,
+    )
+    image.write(stream.read(), filter=pikepdf.Name.DCTDecode)
+
+    # One point per pixel, matching Pillow's default 72 dpi page size.
+    contents = pikepdf.Stream(pdf, f"q {width} 0 0 {height} 0 0 cm /Im0 Do Q".encode("ascii"))
+    page = pikepdf.Dictionary(
+        Type=pikepdf.Name.Page,
+        MediaBox=[0, 0, width, height],
+        Resources=pikepdf.Dictionary(XObject=pikepdf.Dictionary(Im0=image)),
+        Contents=contents,
+    )
+    pdf.pages.append(pikepdf.Page(page))
+    return True
+
+
+def _render_image_pdf(stream: BinaryIO, image_module) -> "pikepdf.Pdf":
+    """Render the image in *stream* to a one-page PDF with Pillow."""
+
+    stream.seek(0)
+    with image_module.open(stream) as opened:
+        opened.load()
+        image = opened if opened.mode == "RGB" else opened.convert("RGB")
+        page_buffer = io.BytesIO()
+        image.save(page_buffer, format="PDF")
+        if image is not opened:
+            image.close()
+
+    page_buffer.seek(0)
+    return pikepdf.open(page_buffer)
+
+
+def _images_to_pdf_pikepdf(image_inputs: Iterable[ImageInput], image_module) -> ImageToPDFOutput:
+    """Build the PDF with pikepdf, copying JPEG bitstreams instead of re-encoding."""
+
+    pdf = pikepdf.Pdf.new()
+    # Pages are copied lazily from rendered PDFs, so keep them open until saved.
+    rendered: List["pikepdf.Pdf"] = []
+    processed_files: List[str] = []
+    skipped_files: List[str] = []
+
+    try:
+        for image_input in image_inputs:
+            stream = image_input.stream
+            try:
+                stream.seek(0)
+            except Exception:
+                stream = io.BytesIO(stream.read())  # type: ignore[arg-type]
+                image_input.stream = stream
+
+            try:
+                if not _append_jpeg_page(pdf, stream, image_module):
+                    rendered.append(_render_image_pdf(stream, image_module))
+                    pdf.pages.extend(rendered[-1].pages)
+            except Exception:
+                skipped_files.append(image_input.name)
+                continue
+
+            processed_files.append(image_input.name)
+
+        if not processed_files:
+            return ImageToPDFOutput(
+                buffer=None,
+                processed_count=0,
+                skipped_count=len(skipped_files),
+                skipped_files=skipped_files,
+            )
+
+        output_buffer = io.BytesIO()
+        try:
+            pdf.save(output_buffer)
+        except Exception:
+            return ImageToPDFOutput(
+                buffer=None,
+                processed_count=0,
+                skipped_count=len(skipped_files) + len(processed_files),
+                skipped_files=skipped_files + processed_files,
+            )
+    finally:
+        pdf.close()
+        for page_pdf in rendered:
+            page_pdf.close()
+
+    output_buffer.seek(0)
+    return ImageToPDFOutput(
+        buffer=output_buffer,
+        processed_count=len(processed_files),
+        skipped_count=len(skipped_files),
+        skipped_files=skipped_files,
     )
 
 
 def images_to_pdf_streams(inputs: Iterable[ImageInput]) -> ImageToPDFOutput:
-    """Convert image streams into a single in-memory PDF document."""
+    """Convert image streams into a single in-memory PDF document.
+
+    With pikepdf installed, JPEGs are embedded as-is rather than decoded and
+    re-encoded, and other images are rendered one at a time.
+    """
 
     try:
         from PIL import Image
@@ -202,6 +686,9 @@ def images_to_pdf_streams(inputs: Iterable[ImageInput]) -> ImageToPDFOutput:
             "Pillow is required. Install with: python -m pip install Pillow"
         ) from exc
 
+    if _ensure_pikepdf():
+        return _images_to_pdf_pikepdf(inputs, Image)
+
     processed_entries: List[tuple[str, "Image.Image"]] = []
     skipped_files: List[str] = []
 
@@ -278,6 +765,42 @@ def images_to_pdf_streams(inputs: Iterable[ImageInput]) -> ImageToPDFOutput:
     )
 
 
+def _deflate(data: bytes) -> bytes:
+    """Deflate *data* at zlib level 9: smallest output, and cheap next to parsing the PDF."""
+
+    return zlib.compress(data, 9)
+
+
+def _page_content_data(page) -> Optional[bytes]:
+    """Return *page*'s content streams decoded and joined, or None if it has none.
+
+    The decoded bytes are deflated as they are: parsing them into a
+    ``ContentStream`` only to serialize the same operators again was most of
+    the cost of compressing a PDF.
+    """
+
+    from PyPDF2.generic import ArrayObject
+
+    content = page.get_contents()
+    if content is None:
+        return None
+    if isinstance(content, ArrayObject):
+        # Stream boundaries only separate tokens, so a newline joins them safely.
+        return b"\n".join(part.get_object().get_data() for part in content)
+    return content.get_data()
+
+
+def _set_page_contents(page, deflated: bytes) -> None:
+    """Replace *page*'s contents with a single already-deflated stream."""
+
+    from PyPDF2.generic import EncodedStreamObject, NameObject
+
+    encoded = EncodedStreamObject()
+    encoded[NameObject("/Filter")] = NameObject("/FlateDecode")
+    encoded._data = deflated
+    page[NameObject("/Contents")] = encoded
+
+
 def compress_pdf_stream(
     pdf_input: PDFInput,
     default_password: Optional[str] = None,
@@ -288,6 +811,7 @@ def compress_pdf_stream(
     This preserves pages but drops metadata to save a few bytes.
     """
 
+    _ensure_pypdf2()
     stream = pdf_input.stream
     try:
         stream.seek(0)
@@ -308,7 +832,7 @@ def compress_pdf_stream(
         )
 
     if getattr(reader, "is_encrypted", False):
-        passwords = _passwords_to_try(pdf_input, default_password)
+        passwords = _passwords_to_try(pdf_input, _base_passwords(default_password))
         unlocked = False
         for password in passwords:
             if password and try_decrypt(reader, password):
@@ -328,7 +852,9 @@ def compress_pdf_stream(
 
     for page in reader.pages:
         try:
-            page.compress_content_streams()  # type: ignore[func-returns-value]
+            data = _page_content_data(page)
+            if data is not None:
+                _set_page_contents(page, _deflate(data))
         except Exception:
             # If compression fails for a page, still include it uncompressed.
             pass
@@ -366,49 +892,168 @@ def compress_pdf_stream(
     )
 
 
+def _prompt_for_password(path: str, rel: str) -> _ParsedPDF:
+    """Prompt until a password unlocks *path* or the user enters nothing."""
+
+    reader = PdfReader(path)
+    while True:
+        password = getpass(f"  Password for '{rel}': ")
+        if not password:
+            return _ParsedPDF(locked=True)
+        if try_decrypt(reader, password):
+            return _ParsedPDF(reader=reader)
+
+
+@functools.lru_cache(maxsize=None)
+def _find_qpdf() -> Optional[str]:
+    return shutil.which("qpdf")
+
+
+def _has_encrypted(paths: Iterable[str]) -> bool:
+    """Return True if any PDF in *paths* looks encrypted; unreadable files are ignored.
+
+    Only sniffs raw bytes, so a miss just means qpdf fails and the PyPDF2
+    loop (which does check properly) takes over.
+    """
+
+    for path in paths:
+        try:
+            with open(path, "rb") as pdf_file:
+                if _is_likely_encrypted(pdf_file):
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+def _try_qpdf_merge(
+    sorted_inputs: Sequence[str],
+    output_path: str,
+    output_dir: str,
+    common_password: Optional[str] = None,
+) -> bool:
+    """Merge *sorted_inputs* into *output_path* (inside *output_dir*) with the qpdf binary.
+
+    Returns False (leaving *output_path* untouched) when qpdf is missing or
+    fails, e.g. because a file is locked with a different password.
+    """
+
+    qpdf = _find_qpdf()
+    if qpdf is None:
+        return False
+
+    arguments = ["--empty", "--pages"]
+    for path in sorted_inputs:
+        arguments.append(path)
+        if common_password:
+            arguments.append(f"--password={common_password}")
+
+    # Let qpdf create the output itself so it gets the usual umask-derived
+    # mode; a mkstemp file would stay 0600 through the rename.
+    tmp_dir = tempfile.mkdtemp(prefix=".pdfmerger-", dir=output_dir)
+    tmp_output = os.path.join(tmp_dir, "merged.pdf")
+    arguments += ["--", tmp_output]
+
+    # Pass arguments through a private @file: keeps the password out of the
+    # process list and avoids command-line length limits on large folders.
+    fd, arg_path = tempfile.mkstemp(suffix=".qpdfargs", text=True)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as arg_file:
+            arg_file.write("\n".join(arguments) + "\n")
+
+        try:
+            result = subprocess.run(
+                [qpdf, f"@{arg_path}"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            return False
+
+        # Exit status 3 means qpdf succeeded but reported warnings.
+        if result.returncode not in (0, 3):
+            return False
+
+        os.replace(tmp_output, output_path)
+        return True
+    finally:
+        os.remove(arg_path)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
 def merge_pdfs(
-    inputs: Sequence[str],
+    inputs: Iterable[str],
     output_path: str,
     common_password: Optional[str] = None,
     prompt_missing_passwords: bool = True,
     order_mode: str = "name",
 ) -> Tuple[int, int]:
-    """Merge PDFs located at *inputs* into *output_path*."""
+    """Merge PDFs located at *inputs* into *output_path*.
+
+    *inputs* may be any iterable, e.g. :func:`discover_pdfs_iter`; it is
+    consumed once while sorting.
+    """
 
+    # Decorate-sort-undecorate; equal keys fall back to the full path so the
+    # order is deterministic across folders.
     if order_mode == "mtime":
-        sorted_inputs = sorted(inputs, key=lambda path: os.path.getmtime(path))
+        keyed = [(os.path.getmtime(path), path) for path in inputs]
+        keyed.sort()
+        sorted_inputs = [path for _, path in keyed]
+    elif (natsort := _optional_import("natsort")) is not None:
+        # Matches the platform file browser's ordering (locale, case folding).
+        sorted_inputs = natsort.os_sorted(inputs, key=os.path.basename, presort=True)
     else:
-        sorted_inputs = sorted(inputs, key=lambda path: natural_key(os.path.basename(path)))
+        keyed = [(natural_key(os.path.basename(path)), path) for path in inputs]
+        keyed.sort()
+        sorted_inputs = [path for _, path in keyed]
+
+    # Resolve paths once up front, and create the output folder before doing
+    # any merge work so permission problems fail fast.
+    cwd = os.getcwd()
+    rel_paths = {path: os.path.relpath(path, cwd) for path in sorted_inputs}
+    output_dir = os.path.dirname(os.path.join(cwd, output_path))
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+    except Exception as exc:
+        print(f"\n❌ Failed to write output '{output_path}': {exc}")
+        raise
+
+    # qpdf can only merge without asking, so skip it when a prompt may be needed.
+    if _find_qpdf() is not None and (
+        common_password or not prompt_missing_passwords or not _has_encrypted(sorted_inputs)
+    ):
+        print(f"Merging {len(sorted_inputs)} PDF(s) with qpdf...")
+        if _try_qpdf_merge(sorted_inputs, output_path, output_dir, common_password):
+            print(f"\n✅ Saved merged unlocked PDF to: {output_path}")
+            return len(sorted_inputs), 0
+
+    _ensure_pypdf2()
+    passwords = _base_passwords(common_password)
+    parsed_inputs = _parse_prefetched(sorted_inputs, passwords)
 
     writer = PdfWriter()
     merged_count = 0
     skipped_count = 0
 
-    for path in sorted_inputs:
-        rel = os.path.relpath(path)
+    for path, parsed in zip(sorted_inputs, parsed_inputs):
+        rel = rel_paths[path]
         print(f"Processing: {rel}")
         try:
-            reader = PdfReader(path)
-            if getattr(reader, "is_encrypted", False):
-                password: Optional[str] = common_password
-                unlocked = False
-
-                if password:
-                    unlocked = try_decrypt(reader, password)
-
-                while not unlocked and prompt_missing_passwords:
-                    password = getpass(f"  Password for '{rel}': ")
-                    if not password:
-                        break
-                    unlocked = try_decrypt(reader, password)
-
-                if not unlocked:
-                    print("  Could not decrypt (wrong/unknown password). Skipping.")
-                    skipped_count += 1
-                    continue
-
-            for page in reader.pages:
-                writer.add_page(page)
+            if parsed.locked and prompt_missing_passwords:
+                parsed = _prompt_for_password(path, rel)
+
+            if parsed.locked:
+                print("  Could not decrypt (wrong/unknown password). Skipping.")
+                skipped_count += 1
+                continue
+
+            if parsed.error is not None:
+                print(f"  Failed to read '{rel}': {parsed.error}")
+                skipped_count += 1
+                continue
+
+            _append_pages(writer, parsed.reader)
             merged_count += 1
 
         except KeyboardInterrupt:
@@ -420,9 +1065,15 @@ def merge_pdfs(
 
     if merged_count > 0:
         try:
-            os.makedirs(os.path.dirname(os.path.abspath(output_path)) or ".", exist_ok=True)
-            with open(output_path, "wb") as out_file:
+            with open(output_path, "wb", buffering=0) as raw_file, io.BufferedWriter(
+                raw_file, buffer_size=_OUTPUT_BUFFER_SIZE
+            ) as out_file:
                 writer.write(out_file)
+                out_file.flush()
+                if raw_file.tell() >= _DROP_CACHE_MIN_SIZE:
+                    # DONTNEED only evicts clean pages, so sync first.
+                    os.fsync(raw_file.fileno())
+                    _fadvise(raw_file.fileno(), "POSIX_FADV_DONTNEED")
             print(f"\n✅ Saved merged unlocked PDF to: {output_path}")
         except Exception as exc:
             print(f"\n❌ Failed to write output '{output_path}': {exc}")
@@ -1,16 +1,33 @@
-from flask import Flask
+from quart import Quart
 
 from .routes import bp as routes_bp
 
+__all__ = ["create_app"]
 
-def create_app() -> Flask:
+
+def create_app() -> Quart:
     """Application factory for the PDF merger web interface."""
 
-    app = Flask(
+    app = Quart(
         __name__,
         static_folder="static",
         template_folder="templates",
     )
+    # Uploads beyond 512 MiB are refused with 413 before they are buffered.
+    # Quart also times out bodies and responses after 60s by default; lift
+    # that so large merges are not cut off mid-transfer.
+    app.config.update(MAX_CONTENT_LENGTH=512 * 1024 * 1024, BODY_TIMEOUT=None, RESPONSE_TIMEOUT=None)
+    # Each file, and each per-file password, is its own multipart part; Quart's
+    # default of 1,000 parts would refuse merges of a few hundred files.
+    app.config["MAX_FORM_PARTS"] = 10_000
+    # Behind nginx, MERGE_OUTPUT_DIR plus X_ACCEL_REDIRECT_PREFIX (an internal
+    # location aliased to that folder) lets nginx send large merged PDFs;
+    # USE_X_SENDFILE does the same for Apache's mod_xsendfile.
+    app.config.update(MERGE_OUTPUT_DIR=None, X_ACCEL_REDIRECT_PREFIX=None, USE_X_SENDFILE=False)
+    # Background merges via RQ (see webapp/jobs.py) stay off unless a Redis URL
+    # is set. Any of these can be set from PDFMERGER_* environment variables.
+    app.config.update(RQ_REDIS_URL=None, MERGE_JOB_DIR=None, BACKGROUND_MERGE_MIN_SIZE=64 * 1024 * 1024)
+    app.config.from_prefixed_env("PDFMERGER")
 
     app.register_blueprint(routes_bp)
 
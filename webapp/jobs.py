@@ -0,0 +1,142 @@
+"""Optional background merges through RQ (Redis Queue).
+
+Enabled when ``rq`` is installed and the app config sets ``RQ_REDIS_URL``.
+Workers run separately (``rq worker pdfmerger --url <redis-url>``) and must
+see the same ``MERGE_JOB_DIR`` as the web processes.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import shutil
+import tempfile
+import typing as t
+from contextlib import ExitStack
+
+from pdfmerger.core import COPY_CHUNK_SIZE, PDFInput, merge_pdf_streams
+
+try:
+    from redis import Redis
+    from rq import Queue
+    from rq.exceptions import NoSuchJobError
+    from rq.job import Job
+except Exception:  # pragma: no cover - optional dependency
+    Redis = Queue = NoSuchJobError = Job = None
+
+QUEUE_NAME = "pdfmerger"
+FAILED_STATUSES = frozenset({"failed", "stopped", "canceled"})
+
+# Large merges take minutes; RQ's default 180s timeout would kill them.
+_JOB_TIMEOUT = 60 * 60
+_RESULT_TTL = 60 * 60
+
+_MANIFEST = "manifest.json"
+OUTPUT_NAME = "merged.pdf"
+
+
+@functools.lru_cache(maxsize=None)
+def _queue(redis_url: str) -> Queue:
+    return Queue(QUEUE_NAME, connection=Redis.from_url(redis_url))
+
+
+def get_queue(config: t.Mapping[str, t.Any]) -> Queue | None:
+    """Return the merge queue, or None when background merges are not configured."""
+
+    redis_url = config.get("RQ_REDIS_URL")
+    if not redis_url or Queue is None:
+        return None
+    return _queue(redis_url)
+
+
+def enqueue_merge(
+    queue: Queue,
+    job_root: str | None,
+    pdf_inputs: t.Sequence[PDFInput],
+    default_password: str | None,
+    skipped_files: t.Sequence[str] = (),
+) -> str:
+    """Copy *pdf_inputs* into a private job folder, queue the merge and return the job id.
+
+    Passwords go into the folder's manifest rather than the job arguments so
+    they are never stored in Redis. *skipped_files* are reported as skipped
+    ahead of any the merge itself skips.
+    """
+
+    job_dir = tempfile.mkdtemp(prefix="pdfmerger-job-", dir=job_root)
+    try:
+        for index, pdf_input in enumerate(pdf_inputs):
+            pdf_input.stream.seek(0)
+            with open(os.path.join(job_dir, f"{index}.pdf"), "wb") as target:
+                shutil.copyfileobj(pdf_input.stream, target, COPY_CHUNK_SIZE)
+        manifest = {
+            "names": [pdf_input.name for pdf_input in pdf_inputs],
+            "passwords": [pdf_input.password for pdf_input in pdf_inputs],
+            "default_password": default_password,
+            "skipped_files": list(skipped_files),
+        }
+        with open(os.path.join(job_dir, _MANIFEST), "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        job = queue.enqueue(merge_job, job_dir, job_timeout=_JOB_TIMEOUT, result_ttl=_RESULT_TTL)
+    except BaseException:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        raise
+    return job.id
+
+
+def merge_job(job_dir: str) -> dict[str, t.Any]:
+    """RQ task: merge the inputs in *job_dir* into ``merged.pdf`` alongside them."""
+
+    try:
+        return _merge_job_dir(job_dir)
+    except BaseException:
+        # Nobody can download a failed job, so don't leave its files behind.
+        shutil.rmtree(job_dir, ignore_errors=True)
+        raise
+
+
+def _merge_job_dir(job_dir: str) -> dict[str, t.Any]:
+    manifest_path = os.path.join(job_dir, _MANIFEST)
+    with open(manifest_path, encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+    os.unlink(manifest_path)
+
+    names: list[str] = manifest["names"]
+    input_paths = [os.path.join(job_dir, f"{index}.pdf") for index in range(len(names))]
+    with ExitStack() as stack:
+        pdf_inputs = [
+            PDFInput(name=name, stream=stack.enter_context(open(path, "rb")), password=password)
+            for name, path, password in zip(names, input_paths, manifest["passwords"])
+        ]
+        result = merge_pdf_streams(pdf_inputs, default_password=manifest["default_password"])
+    for path in input_paths:
+        os.unlink(path)
+
+    if result.has_output and result.buffer is not None:
+        with result.buffer, open(os.path.join(job_dir, OUTPUT_NAME), "wb") as target:
+            shutil.copyfileobj(result.buffer, target, COPY_CHUNK_SIZE)
+
+    skipped_files = manifest["skipped_files"] + result.skipped_files
+    return {
+        "has_output": result.has_output,
+        "merged_count": result.merged_count,
+        "skipped_count": len(skipped_files),
+        "skipped_files": skipped_files,
+        "job_dir": job_dir,
+    }
+
+
+def job_state(queue: Queue, job_id: str) -> tuple[str, dict[str, t.Any] | None] | None:
+    """Return ``(status, result)`` for *job_id*, or None if RQ does not know it.
+
+    *result* is None until the job has finished.
+    """
+
+    try:
+        job = Job.fetch(job_id, connection=queue.connection)
+    except NoSuchJobError:
+        return None
+    status = str(job.get_status(refresh=False).value)
+    return status, job.return_value() if status == "finished" else None
@@ -2,13 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import io
+import os
+import shutil
+import tempfile
+import time
 import typing as t
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
 
-from flask import Blueprint, Response, render_template, request, send_file
+from quart import Blueprint, Response, current_app, render_template, request, send_file, url_for
+from quart.datastructures import FileStorage
 
+from . import jobs
 from pdfmerger.core import (
+    COPY_CHUNK_SIZE,
     ImageInput,
+    ImageToPDFOutput,
     MergeOutput,
     CompressOutput,
     PDFInput,
@@ -19,71 +33,327 @@ from pdfmerger.core import (
 
 bp = Blueprint("routes", __name__)
 
+# Blocking file work (download read-ahead, job hand-off, output sweeps).
+_IO_POOL = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 4), thread_name_prefix="pdfmerger-io")
+
+# PDF readers accept the header anywhere in the first KiB of the file.
+_PDF_MAGIC = b"%PDF-"
+_PDF_SNIFF_SIZE = 1024
+
+# Offloaded outputs are left for the front-end server and swept after this.
+_OFFLOAD_MAX_AGE = 5 * 60
+
+# Rendered static pages as ``{template: (html, etag)}``, filled on first request.
+_PAGE_CACHE: dict[str, tuple[bytes, str]] = {}
+
+# Merging, conversion and compression are CPU-bound; running them here rather
+# than on the loop's default executor caps concurrent jobs at the CPU count,
+# and extra requests queue instead of oversubscribing the cores.
+_MERGE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="pdfmerge")
+
+# Form keys of the form ``file_passwords[<filename>]``.
+_PER_FILE_PASSWORD_PREFIX = "file_passwords["
+
+
+async def _static_page(template: str) -> Response:
+    """Serve *template*, rendered once, with a strong ETag (304 on a match).
+
+    The pages take no context, so the rendered HTML only changes with the
+    templates themselves; debug mode re-renders to pick up edits.
+    """
+
+    cached = None if current_app.debug else _PAGE_CACHE.get(template)
+    if cached is None:
+        html = (await render_template(template)).encode()
+        cached = (html, hashlib.blake2b(html, digest_size=8).hexdigest())
+        _PAGE_CACHE[template] = cached
+    html, etag = cached
+
+    if request.if_none_match.contains(etag):
+        response = Response(b"", status=304)
+    else:
+        response = Response(html, mimetype="text/html")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 300
+    return response
+
 
 @bp.get("/")
-def home() -> str:
+async def home() -> Response:
     """Render the application home page."""
 
-    return render_template("home.html")
+    return await _static_page("home.html")
 
 
 @bp.get("/merge")
-def merge_form() -> str:
+async def merge_form() -> Response:
     """Render the upload interface for merging PDFs."""
 
-    return render_template("upload.html")
+    return await _static_page("upload.html")
 
 
 @bp.get("/images-to-pdf")
-def images_to_pdf_form() -> str:
+async def images_to_pdf_form() -> Response:
     """Render the interface for converting images to a PDF."""
 
-    return render_template("images_to_pdf.html")
+    return await _static_page("images_to_pdf.html")
 
 
 @bp.get("/compress")
-def compress_form() -> str:
+async def compress_form() -> Response:
     """Render the interface for compressing a PDF."""
 
-    return render_template("compress.html")
+    return await _static_page("compress.html")
+
+
+def _offload_header(path: str) -> tuple[str, str] | None:
+    """Return the header that hands *path* to the front-end server, if one is configured."""
+
+    prefix = current_app.config["X_ACCEL_REDIRECT_PREFIX"]
+    if prefix:
+        return "X-Accel-Redirect", f"{prefix.rstrip('/')}/{quote(os.path.basename(path))}"
+    if current_app.config["USE_X_SENDFILE"]:
+        return "X-Sendfile", path
+    return None
+
+
+def _sweep_offloaded(directory: str, max_age: float) -> None:
+    """Delete offloaded merge outputs in *directory* older than *max_age* seconds.
+
+    The front-end server reads those files after the response has left
+    Python, so they cannot be removed when the response is released.
+    """
+
+    cutoff = time.time() - max_age
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not (entry.name.startswith("pdfmerger-") and entry.name.endswith(".pdf")):
+                continue
+            try:
+                if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+async def _offload_pdf(path: str, download_name: str) -> Response | None:
+    """Let nginx (X-Accel-Redirect) or Apache (X-Sendfile) send *path*, when configured."""
+
+    header = _offload_header(path)
+    if header is None:
+        return None
+    await _run_io(_sweep_offloaded, os.path.dirname(path), _OFFLOAD_MAX_AGE)
+    response = Response(b"", mimetype="application/pdf")
+    response.headers[header[0]] = header[1]
+    response.headers.add("Content-Disposition", "attachment", filename=download_name)
+    return _no_store(response)
+
+
+def _no_store(response: Response) -> Response:
+    """Keep a generated PDF out of browser and proxy caches.
+
+    Quart's ``send_file`` always marks responses public and cacheable, but
+    these are decrypted, per-request documents.
+    """
+
+    response.cache_control.public = False
+    response.cache_control.max_age = None
+    response.cache_control.private = True
+    response.cache_control.no_store = True
+    response.headers.pop("Expires", None)
+    return response
+
+
+def _remove_path(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+async def _send_pdf(
+    buffer: t.BinaryIO | None,
+    download_name: str,
+    path: str | None = None,
+    remove: str | None = None,
+) -> Response:
+    """Return *buffer* as a PDF attachment named *download_name*.
+
+    A temporary file at *path* is served from disk, and it (or the file or
+    folder named by *remove*) is deleted once the response body is released.
+    Quart's ``send_file`` only accepts ``BytesIO`` otherwise, so spooled and
+    temporary file outputs are streamed in chunks read on ``_IO_POOL``, with
+    the next read in flight while one is sent.
+    """
+
+    if path is not None:
+        if buffer is not None:
+            buffer.close()
+        # No ETag or range support: the file is deleted once it has been sent,
+        # so a resumed download could never be served.
+        response = await send_file(
+            path,
+            mimetype="application/pdf",
+            as_attachment=True,
+            attachment_filename=download_name,
+            add_etags=False,
+        )
+        # Quart has no call_on_close; tie cleanup to the body's lifetime instead.
+        weakref.finalize(response.response, _remove_path, remove or path)
+        return _no_store(response)
+
+    # send_file sets Content-Length from the buffer size.
+    if isinstance(buffer, io.BytesIO):
+        response = await send_file(
+            buffer,
+            mimetype="application/pdf",
+            as_attachment=True,
+            attachment_filename=download_name,
+        )
+        return _no_store(response)
+
+    buffer.seek(0, io.SEEK_END)
+    size = buffer.tell()
+    buffer.seek(0)
+    loop = asyncio.get_running_loop()
+
+    async def body() -> t.AsyncIterator[bytes]:
+        pending = loop.run_in_executor(_IO_POOL, buffer.read, COPY_CHUNK_SIZE)
+        try:
+            while True:
+                chunk = await pending
+                if not chunk:
+                    break
+                pending = loop.run_in_executor(_IO_POOL, buffer.read, COPY_CHUNK_SIZE)
+                yield chunk
+        finally:
+            # A read may still be running if the client went away mid-download.
+            pending.add_done_callback(lambda _: buffer.close())
+
+    response = Response(body(), mimetype="application/pdf")
+    response.content_length = size
+    response.headers.add("Content-Disposition", "attachment", filename=download_name)
+    return _no_store(response)
+
+
+async def _run_job(func: t.Callable[..., t.Any], *args: t.Any, **kwargs: t.Any) -> t.Any:
+    """Run *func* on ``_MERGE_POOL`` and await its result."""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_MERGE_POOL, functools.partial(func, *args, **kwargs))
+
+
+def _is_seekable(stream: t.BinaryIO) -> bool:
+    # SpooledTemporaryFile only grew seekable() in Python 3.11, but always seeks.
+    return isinstance(stream, tempfile.SpooledTemporaryFile) or stream.seekable()
+
+
+def _rewind_uploads(storages: t.Sequence[FileStorage]) -> list[t.BinaryIO]:
+    """Return the rewound stream for each uploaded file, in order.
+
+    Werkzeug spools every upload into a seekable file, so a stream that
+    cannot seek is refused with ValueError rather than read into memory.
+    """
+
+    streams: list[t.BinaryIO] = []
+    for storage in storages:
+        stream = storage.stream
+        if not _is_seekable(stream):
+            raise ValueError(f"{storage.filename} cannot be rewound")
+        stream.seek(0)
+        streams.append(stream)
+    return streams
+
+
+async def _run_io(func: t.Callable[..., t.Any], *args: t.Any, **kwargs: t.Any) -> t.Any:
+    """Run blocking I/O *func* on ``_IO_POOL`` and await its result."""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_IO_POOL, functools.partial(func, *args, **kwargs))
+
+
+def _looks_like_pdf(stream: t.BinaryIO) -> bool:
+    head = stream.read(_PDF_SNIFF_SIZE)
+    stream.seek(0)
+    return _PDF_MAGIC in head
+
+
+def _input_size(pdf_inputs: t.Sequence[PDFInput]) -> int:
+    total = 0
+    for pdf_input in pdf_inputs:
+        pdf_input.stream.seek(0, io.SEEK_END)
+        total += pdf_input.stream.tell()
+        pdf_input.stream.seek(0)
+    return total
+
+
+def _merge_failure(skipped_files: t.Sequence[str]) -> tuple[str, int]:
+    if skipped_files:
+        return f"Unable to merge the provided PDFs. Skipped: {', '.join(skipped_files)}.", 400
+    return "Unable to merge the provided PDFs.", 400
+
+
+def _set_merge_headers(
+    response: Response, merged_count: int, skipped_count: int, skipped_files: t.Sequence[str]
+) -> None:
+    headers: dict[str, str] = {}
+    if skipped_files:
+        headers["X-PDFMerger-Skipped"] = ",".join(skipped_files)
+        headers["X-PDFMerger-Skipped-Count"] = str(skipped_count)
+    headers["X-PDFMerger-Merged-Count"] = str(merged_count)
+    response.headers.update(headers)
+
+
+def _merge_pending(status_url: str) -> tuple[str, int, dict[str, str]]:
+    # Refresh makes a browser that posted the plain HTML form poll by itself.
+    return (
+        "Merge in progress; the PDF will download from this page when it is ready.",
+        202,
+        {"Location": status_url, "Retry-After": "2", "Refresh": f"2; url={status_url}"},
+    )
 
 
 def _extract_per_file_passwords(form_data: t.Mapping[str, str]) -> dict[str, str]:
     """Parse per-file password entries from the submitted form."""
 
-    passwords: dict[str, str] = {}
-    prefix = "file_passwords["
-    suffix = "]"
-    for key, value in form_data.items():
-        if key.startswith(prefix) and key.endswith(suffix):
-            filename = key[len(prefix) : -len(suffix)]
-            if value:
-                passwords[filename] = value
-    return passwords
+    start = len(_PER_FILE_PASSWORD_PREFIX)
+    return {
+        key[start:-1]: value
+        for key, value in form_data.items()
+        if value and key.startswith(_PER_FILE_PASSWORD_PREFIX) and key.endswith("]")
+    }
 
 
 @bp.post("/merge")
-def merge() -> Response | tuple[str, int]:
+async def merge() -> Response | tuple[str, int] | tuple[str, int, dict[str, str]]:
     """Accept uploaded PDFs and return the merged output."""
 
-    uploaded_files = request.files.getlist("files")
+    files = await request.files
+    form = await request.form
+    uploaded_files = files.getlist("files")
     if not uploaded_files:
         return "No PDF files were uploaded.", 400
 
-    shared_password = request.form.get("shared_password") or None
-    per_file_passwords = _extract_per_file_passwords(request.form)
+    shared_password = form.get("shared_password") or None
+    per_file_passwords = _extract_per_file_passwords(form)
+
+    named_files = [storage for storage in uploaded_files if storage.filename]
+    try:
+        streams = _rewind_uploads(named_files)
+    except (OSError, ValueError) as exc:
+        return f"Unreadable upload: {exc}", 400
 
     pdf_inputs: list[PDFInput] = []
-    for storage in uploaded_files:
-        if not storage.filename:
+    # Files without a PDF header are skipped here instead of being parsed.
+    rejected: list[str] = []
+    for storage, stream in zip(named_files, streams):
+        if not _looks_like_pdf(stream):
+            rejected.append(storage.filename)
             continue
-        stream = storage.stream
-        try:
-            stream.seek(0)
-        except Exception:
-            # Werkzeug's stream objects are typically seekable, but fall back to BytesIO if needed.
-            data = storage.read()
-            stream = io.BytesIO(data)
         pdf_inputs.append(
             PDFInput(
                 name=storage.filename,
@@ -92,57 +362,109 @@ def merge() -> Response | tuple[str, int]:
             )
         )
 
-    if not pdf_inputs:
+    if not pdf_inputs and not rejected:
         return "No valid PDF files were provided.", 400
 
-    merge_result: MergeOutput = merge_pdf_streams(pdf_inputs, default_password=shared_password)
+    # Big merges go to an RQ worker when one is configured, so the client
+    # polls instead of holding a connection open for minutes.
+    queue = jobs.get_queue(current_app.config)
+    if (
+        queue is not None
+        and pdf_inputs
+        and _input_size(pdf_inputs) >= current_app.config["BACKGROUND_MERGE_MIN_SIZE"]
+    ):
+        job_id = await _run_io(
+            jobs.enqueue_merge,
+            queue,
+            current_app.config["MERGE_JOB_DIR"],
+            pdf_inputs,
+            shared_password,
+            rejected,
+        )
+        return _merge_pending(url_for("routes.merge_status", job_id=job_id))
+
+    if pdf_inputs:
+        # Run off the event loop so it keeps serving other uploads meanwhile.
+        merge_result: MergeOutput = await _run_job(
+            merge_pdf_streams,
+            pdf_inputs,
+            default_password=shared_password,
+            named_output=True,
+            output_dir=current_app.config["MERGE_OUTPUT_DIR"],
+        )
+    else:
+        merge_result = MergeOutput(buffer=None, merged_count=0, skipped_count=0, skipped_files=[])
+    merge_result.skipped_files = rejected + merge_result.skipped_files
+    merge_result.skipped_count += len(rejected)
 
     if not merge_result.has_output or merge_result.buffer is None:
-        message = "Unable to merge the provided PDFs."
-        if merge_result.skipped_files:
-            skipped_list = ", ".join(merge_result.skipped_files)
-            message = f"Unable to merge the provided PDFs. Skipped: {skipped_list}."
-        return message, 400
-
-    response = send_file(
-        merge_result.buffer,
-        mimetype="application/pdf",
-        as_attachment=True,
-        download_name="merged_unlocked.pdf",
+        return _merge_failure(merge_result.skipped_files)
+
+    response = None
+    if merge_result.path is not None:
+        merge_result.buffer.close()
+        response = await _offload_pdf(merge_result.path, "merged_unlocked.pdf")
+    if response is None:
+        response = await _send_pdf(merge_result.buffer, "merged_unlocked.pdf", merge_result.path)
+    _set_merge_headers(
+        response, merge_result.merged_count, merge_result.skipped_count, merge_result.skipped_files
     )
+    return response
+
+
+@bp.get("/merge/<job_id>")
+async def merge_status(job_id: str) -> Response | tuple[str, int] | tuple[str, int, dict[str, str]]:
+    """Report on a background merge, returning the merged PDF once it is done."""
+
+    queue = jobs.get_queue(current_app.config)
+    state = None if queue is None else await _run_io(jobs.job_state, queue, job_id)
+    if state is None:
+        return "Unknown merge job.", 404
 
-    if merge_result.skipped_files:
-        response.headers["X-PDFMerger-Skipped"] = ",".join(merge_result.skipped_files)
-        response.headers["X-PDFMerger-Skipped-Count"] = str(merge_result.skipped_count)
+    status, result = state
+    if status in jobs.FAILED_STATUSES:
+        return "The background merge failed.", 500
+    if result is None:
+        return _merge_pending(url_for("routes.merge_status", job_id=job_id))
 
-    response.headers["X-PDFMerger-Merged-Count"] = str(merge_result.merged_count)
+    if not result["has_output"]:
+        _remove_path(result["job_dir"])
+        return _merge_failure(result["skipped_files"])
+
+    output_path = os.path.join(result["job_dir"], jobs.OUTPUT_NAME)
+    if not os.path.exists(output_path):
+        return "This merge has already been downloaded.", 410
+
+    response = await _send_pdf(None, "merged_unlocked.pdf", output_path, remove=result["job_dir"])
+    _set_merge_headers(response, result["merged_count"], result["skipped_count"], result["skipped_files"])
     return response
 
 
 @bp.post("/images-to-pdf")
-def images_to_pdf() -> Response | tuple[str, int]:
+async def images_to_pdf() -> Response | tuple[str, int]:
     """Accept uploaded images and return a combined PDF."""
 
-    uploaded_images = request.files.getlist("images")
+    files = await request.files
+    uploaded_images = files.getlist("images")
     if not uploaded_images:
         return "No image files were uploaded.", 400
 
-    image_inputs: list[ImageInput] = []
-    for storage in uploaded_images:
-        if not storage.filename:
-            continue
-        stream = storage.stream
-        try:
-            stream.seek(0)
-        except Exception:
-            stream = io.BytesIO(storage.read())
-        image_inputs.append(ImageInput(name=storage.filename, stream=stream))
-
+    named_images = [storage for storage in uploaded_images if storage.filename]
+    try:
+        streams = _rewind_uploads(named_images)
+    except (OSError, ValueError) as exc:
+        return f"Unreadable upload: {exc}", 400
+
+    # No signature check here: Pillow identifies every format it supports from
+    # the header alone, and uploads it cannot open are skipped and reported.
+    image_inputs = [
+        ImageInput(name=storage.filename, stream=stream) for storage, stream in zip(named_images, streams)
+    ]
     if not image_inputs:
         return "No valid image files were provided.", 400
 
     try:
-        result = images_to_pdf_streams(image_inputs)
+        result: ImageToPDFOutput = await _run_job(images_to_pdf_streams, image_inputs)
     except RuntimeError as exc:
         return str(exc), 500
 
@@ -153,50 +475,42 @@ def images_to_pdf() -> Response | tuple[str, int]:
             message = f"Unable to convert the provided images to PDF. Skipped: {skipped_list}."
         return message, 400
 
-    response = send_file(
-        result.buffer,
-        mimetype="application/pdf",
-        as_attachment=True,
-        download_name="images.pdf",
-    )
+    response = await _send_pdf(result.buffer, "images.pdf")
 
-    response.headers["X-Images-Processed"] = str(result.processed_count)
+    headers = {"X-Images-Processed": str(result.processed_count)}
     if result.skipped_files:
-        response.headers["X-Images-Skipped"] = ",".join(result.skipped_files)
-        response.headers["X-Images-Skipped-Count"] = str(result.skipped_count)
+        headers["X-Images-Skipped"] = ",".join(result.skipped_files)
+        headers["X-Images-Skipped-Count"] = str(result.skipped_count)
+    response.headers.update(headers)
 
     return response
 
 
 @bp.post("/compress")
-def compress() -> Response | tuple[str, int]:
+async def compress() -> Response | tuple[str, int]:
     """Accept a PDF upload and return a compressed copy."""
 
-    storage = request.files.get("file")
+    files = await request.files
+    form = await request.form
+    storage = files.get("file")
     if not storage or not storage.filename:
         return "No PDF file was uploaded.", 400
 
-    password = request.form.get("password") or None
+    password = form.get("password") or None
 
-    stream = storage.stream
     try:
-        stream.seek(0)
-    except Exception:
-        stream = io.BytesIO(storage.read())
+        (stream,) = _rewind_uploads([storage])
+    except (OSError, ValueError) as exc:
+        return f"Unreadable upload: {exc}", 400
 
     pdf_input = PDFInput(name=storage.filename, stream=stream, password=password)
-    result: CompressOutput = compress_pdf_stream(pdf_input, default_password=password)
+    result: CompressOutput = await _run_job(compress_pdf_stream, pdf_input, default_password=password)
 
     if not result.has_output or result.buffer is None:
         reason = result.skipped_reason or "Unable to compress the provided PDF."
         return reason, 400
 
     output_name = f"compressed_{storage.filename}"
-    response = send_file(
-        result.buffer,
-        mimetype="application/pdf",
-        as_attachment=True,
-        download_name=output_name,
-    )
+    response = await _send_pdf(result.buffer, output_name)
     response.headers["X-PDFMerger-Pages"] = str(result.pages)
     return response